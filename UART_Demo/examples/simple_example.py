@@ -18,13 +18,79 @@ import sys
 import time
 
 
-def send_command(ser, command):
+def enable_low_latency(ser):
+    """Stop the USB-serial driver from batching received bytes (Linux only)"""
+    if not sys.platform.startswith('linux'):
+        return
+    try:
+        ser.set_low_latency_mode(True)
+    except (ValueError, NotImplementedError):
+        pass  # The driver does not support it
+
+
+def wait_ready(ser, deadline=2.0):
+    """PING every 50 ms until the ESP32 answers PONG; False after `deadline` seconds"""
+    old_timeout = ser.timeout
+    ser.timeout = 0.05
+    try:
+        end = time.perf_counter() + deadline
+        while time.perf_counter() < end:
+            ser.write(b"PING\n")
+            line = ser.read_until(b"\n", 512)
+            while line:
+                if line.strip() == b"PONG":
+                    return True
+                line = ser.read_until(b"\n", 512)  # e.g. boot READY
+        return False
+    finally:
+        ser.timeout = old_timeout
+
+
+def drain(ser, quiet=0.05, limit=0.5):
+    """Discard input until nothing has arrived for `quiet` seconds (at most `limit`)"""
+    start = last = time.perf_counter()
+    while True:
+        now = time.perf_counter()
+        if now - last >= quiet or now - start >= limit:
+            break
+        
+        waiting = ser.in_waiting
+        if waiting:
+            ser.read(waiting)
+            last = time.perf_counter()
+        else:
+            time.sleep(0.005)
+
+
+def read_line(ser, rx, size=512):
+    """Read one line (at most size bytes), keeping extra bytes in rx for next time"""
+    while rx.find(b"\n", 0, size) < 0 and len(rx) < size:
+        # Take everything the driver has buffered in one read
+        chunk = ser.read(ser.in_waiting or 1)
+        if not chunk:
+            break  # Timeout
+        rx.extend(chunk)
+        
+    nl = rx.find(b"\n", 0, size)
+    if nl >= 0:
+        line = bytes(rx[:nl])
+        del rx[:nl + 1]
+    else:
+        line = bytes(rx[:size])
+        del rx[:size]
+    return line
+
+
+def send_command(ser, rx, command):
     """Send a command and return the response"""
     # Send command with newline
-    ser.write(f"{command}\n".encode('utf-8'))
+    try:
+        ser.write(f"{command}\n".encode('utf-8'))
+    except serial.SerialTimeoutException:
+        return "(write timed out)"
     
     # Wait for response (with timeout)
-    response = ser.readline().decode('utf-8', errors='ignore').strip()
+    response = read_line(ser, rx).decode('utf-8', errors='ignore').strip()
     
     return response
 
@@ -45,34 +111,26 @@ def main():
         ser = serial.Serial(
             port=port,
             baudrate=baud,
-            timeout=1.0
+            timeout=1.0,
+            write_timeout=1.0  # Don't hang if the ESP32 stops reading
         )
         
         print("Connected!\n")
-        time.sleep(0.5)  # Give ESP32 time to stabilize
-        
-        # Clear any pending data
-        ser.reset_input_buffer()
-        
-        # Send PING command
-        print("Sending: PING")
-        response = send_command(ser, "PING")
-        print(f"Received: {response}\n")
-        
-        # Send VERSION command
-        print("Sending: VERSION")
-        response = send_command(ser, "VERSION")
-        print(f"Received: {response}\n")
+        enable_low_latency(ser)
+        # Wait until the ESP32 answers, then clear any pending data
+        if not wait_ready(ser):
+            print("Warning: no PONG from the ESP32 yet, continuing anyway\n")
+        drain(ser)
+        rx = bytearray()  # Line buffer shared by all commands
         
-        # Send UPTIME command
-        print("Sending: UPTIME")
-        response = send_command(ser, "UPTIME")
-        print(f"Received: {response}\n")
+        # Send the demo commands in one write, then read the responses in order
+        commands = ["PING", "VERSION", "UPTIME", "INVALID"]
+        ser.write("".join(f"{cmd}\n" for cmd in commands).encode('utf-8'))
         
-        # Try invalid command
-        print("Sending: INVALID")
-        response = send_command(ser, "INVALID")
-        print(f"Received: {response}\n")
+        for command in commands:
+            response = read_line(ser, rx).decode('utf-8', errors='ignore').strip()
+            print(f"Sending: {command}")
+            print(f"Received: {response}\n")
         
         # Interactive mode
         print("-" * 50)
@@ -88,7 +146,7 @@ def main():
                     continue
                 
                 # Send and display response
-                response = send_command(ser, command)
+                response = send_command(ser, rx, command)
                 print(f"Response: {response}")
                 
             except KeyboardInterrupt:
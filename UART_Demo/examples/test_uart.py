@@ -9,16 +9,39 @@ Usage:
     python3 test_uart.py /dev/ttyUSB0
     python3 test_uart.py COM3 --baud 115200
     python3 test_uart.py /dev/ttyUSB0 --stress --count 1000
+    python3 test_uart.py /dev/ttyUSB0 --stress --count 1000 --pipeline 1
+    python3 test_uart.py /dev/ttyUSB0,/dev/ttyUSB1 --all
 
 Requirements:
     pip install pyserial
 """
 
 import serial
-import argparse
+import serial.threaded
+import os
+import queue
+import selectors
+import threading
 import time
 import sys
-from typing import Tuple, List
+from collections import deque
+from types import SimpleNamespace
+from typing import Dict, Tuple, List
+
+
+# Longest response line accepted before it is cut off
+MAX_LINE = 512
+
+# Reader thread receive buffer, allocated once per connection
+RX_BUF_SIZE = 8192
+
+# Commands whose encoded lines are built up front for every tester
+FIXED_COMMANDS = ("PING", "VERSION", "UPTIME")
+
+
+def encode_line(cmd: str) -> bytes:
+    """Return cmd as the newline-terminated bytes sent to the device"""
+    return f"{cmd}\n".encode('utf-8')
 
 
 class Colors:
@@ -31,35 +54,173 @@ class Colors:
     BOLD = '\033[1m'
 
 
+# Plain output when redirected to a file or CI log
+if not sys.stdout.isatty():
+    for _name in ('GREEN', 'RED', 'YELLOW', 'BLUE', 'RESET', 'BOLD'):
+        setattr(Colors, _name, '')
+
+# Stress test progress line
+_PROGRESS_FMT = f"  {Colors.YELLOW}ℹ INFO:{Colors.RESET} Progress: %d/%d (%.2fs)"
+
+
+# Output of parallel port runs is collected per thread and printed as one block
+_print_lock = threading.Lock()
+_output = threading.local()
+
+
+def emit(text: str):
+    """Print a line, or hold it back if this thread is buffering its output"""
+    lines = getattr(_output, 'lines', None)
+    if lines is not None:
+        lines.append(text)
+    else:
+        with _print_lock:
+            sys.stdout.write(text + "\n")
+
+
 def print_test(name: str):
     """Print test name"""
-    print(f"\n{Colors.BLUE}{Colors.BOLD}[TEST]{Colors.RESET} {name}")
+    emit(f"\n{Colors.BLUE}{Colors.BOLD}[TEST]{Colors.RESET} {name}")
 
 
 def print_pass(msg: str):
     """Print success message"""
-    print(f"  {Colors.GREEN}✓ PASS:{Colors.RESET} {msg}")
+    emit(f"  {Colors.GREEN}✓ PASS:{Colors.RESET} {msg}")
 
 
 def print_fail(msg: str):
     """Print failure message"""
-    print(f"  {Colors.RED}✗ FAIL:{Colors.RESET} {msg}")
+    emit(f"  {Colors.RED}✗ FAIL:{Colors.RESET} {msg}")
 
 
 def print_info(msg: str):
     """Print info message"""
-    print(f"  {Colors.YELLOW}ℹ INFO:{Colors.RESET} {msg}")
+    emit(f"  {Colors.YELLOW}ℹ INFO:{Colors.RESET} {msg}")
+
+
+class _LineQueue(serial.threaded.Protocol):
+    """Reader thread protocol that queues each received line (without newline)
+
+    Received bytes go into one fixed buffer; ``head``..``tail`` is the part
+    not yet split into lines. The unparsed tail is moved to the front only
+    when the buffer end is reached, so bursts never reallocate it.
+    """
+    
+    def __init__(self, lines: queue.Queue):
+        self.lines = lines
+        self.buffer = bytearray(RX_BUF_SIZE)
+        self.view = memoryview(self.buffer)
+        self.head = 0
+        self.tail = 0
+        self.error = None  # why the reader stopped, reported on disconnect
+        
+    def connection_lost(self, exc):
+        """Keep the error for the tester instead of raising it in the reader thread"""
+        self.error = exc
+        
+    def data_received(self, data: bytes):
+        """Copy data into the buffer and queue every completed line"""
+        data = memoryview(data)
+        while data:
+            if self.tail == RX_BUF_SIZE:
+                self._compact()
+            n = min(len(data), RX_BUF_SIZE - self.tail)
+            self.view[self.tail:self.tail + n] = data[:n]
+            self.tail += n
+            data = data[n:]
+            self._split_lines()
+            
+    def _split_lines(self):
+        """Queue complete lines; over-long lines are cut at MAX_LINE"""
+        while True:
+            end = min(self.tail, self.head + MAX_LINE)
+            nl = self.buffer.find(b"\n", self.head, end)
+            if nl >= 0:
+                self.lines.put(bytes(self.view[self.head:nl]))
+                self.head = nl + 1
+            elif end - self.head == MAX_LINE:
+                self.lines.put(bytes(self.view[self.head:end]))
+                self.head = end
+            else:
+                break
+                
+        if self.head == self.tail:
+            self.head = self.tail = 0
+            
+    def _compact(self):
+        """Move the unparsed bytes (always < MAX_LINE) to the buffer start"""
+        pending = self.tail - self.head
+        self.view[:pending] = self.view[self.head:self.tail]
+        self.head = 0
+        self.tail = pending
+
+
+class _FdReaderThread(serial.threaded.ReaderThread):
+    """ReaderThread that reads the port's file descriptor directly (POSIX only)
+
+    A selector registered once on the descriptor plus os.read() replace
+    Serial.read(in_waiting or 1): the thread wakes as soon as bytes arrive,
+    without pyserial's in_waiting ioctl and timeout bookkeeping per chunk.
+    It also watches pyserial's abort pipe, so stop() wakes it immediately.
+    """
+    
+    def run(self):
+        """Reader loop"""
+        self.protocol = self.protocol_factory()
+        self.protocol.connection_made(self)
+        self._connection_made.set()
+        
+        fd = self.serial.fileno()
+        # stop() calls cancel_read(), which writes to this pipe
+        abort_fd = self.serial.pipe_abort_read_r
+        sel = selectors.DefaultSelector()
+        sel.register(fd, selectors.EVENT_READ)
+        sel.register(abort_fd, selectors.EVENT_READ)
+        error = None
+        while self.alive and self.serial.is_open:
+            try:
+                ready = [key.fd for key, _ in sel.select()]
+                if abort_fd in ready:
+                    os.read(abort_fd, 1000)  # Consume the wakeup
+                    break
+                data = os.read(fd, RX_BUF_SIZE)
+                if not data:
+                    raise serial.SerialException("device disconnected")
+                self.protocol.data_received(data)
+            except BlockingIOError:
+                continue  # Spurious wakeup on the non-blocking descriptor
+            except (OSError, serial.SerialException) as e:
+                if self.alive:  # Not just the port being closed under us
+                    error = e
+                break
+                
+        sel.close()
+        self.alive = False
+        self.protocol.connection_lost(error)
+        self.protocol = None
 
 
 class UARTTester:
     """UART testing class"""
     
-    def __init__(self, port: str, baud: int = 115200, timeout: float = 1.0):
+    def __init__(self, port: str, baud: int = 115200, timeout: float = 1.0,
+                 quiet: bool = False, stop: threading.Event = None):
         """Initialize UART connection"""
         self.port = port
         self.baud = baud
         self.timeout = timeout
+        self.quiet = quiet  # only print a one-line PASS/FAIL summary
+        # Set from the main thread to interrupt a run on a worker thread
+        self.stop = stop if stop is not None else threading.Event()
         self.ser = None
+        self._fd = None  # raw descriptor for the stress path, POSIX only
+        self._tx_sel = None  # waits for the descriptor to accept more data
+        self._write = None  # _write_raw() on POSIX, else ser.write()
+        self._reader = None
+        self._protocol = None
+        self._lines = queue.Queue()  # filled by the reader thread
+        # Encoded command lines, filled in on first use of other commands
+        self._cmd_cache: Dict[str, bytes] = {cmd: encode_line(cmd) for cmd in FIXED_COMMANDS}
         self.test_passed = 0
         self.test_failed = 0
         
@@ -72,54 +233,182 @@ class UARTTester:
                 bytesize=serial.EIGHTBITS,
                 parity=serial.PARITY_NONE,
                 stopbits=serial.STOPBITS_ONE,
-                timeout=self.timeout
+                timeout=self.timeout,
+                write_timeout=self.timeout  # Don't hang if the device stops reading
             )
-            print_info(f"Connected to {self.port} at {self.baud} baud")
-            time.sleep(0.5)  # Allow ESP32 to stabilize
-            self.ser.reset_input_buffer()
-            return True
         except serial.SerialException as e:
             print_fail(f"Failed to open port: {e}")
             return False
             
+        print_info(f"Connected to {self.port} at {self.baud} baud")
+        
+        # The port is open from here on, so close it again on failure
+        try:
+            self._enable_low_latency()
+            if not self._wait_ready():
+                print_info("No PONG to the readiness probe, continuing anyway")
+            self._drain()  # Discard boot messages and late probe replies
+        except serial.SerialException as e:
+            print_fail(f"Readiness probe failed: {e}")
+            self.ser.close()
+            return False
+            
+        # Receive on a background thread so RX overlaps with our writes
+        if os.name != 'nt':
+            self._fd = self.ser.fileno()
+            self._tx_sel = selectors.DefaultSelector()
+            self._tx_sel.register(self._fd, selectors.EVENT_WRITE)
+            reader_class = _FdReaderThread
+            self._write = self._write_raw
+        else:
+            reader_class = serial.threaded.ReaderThread
+            self._write = self.ser.write
+        self._reader = reader_class(self.ser, lambda: _LineQueue(self._lines))
+        self._reader.start()
+        _, self._protocol = self._reader.connect()
+        return True
+        
+    def _wait_ready(self, deadline: float = 2.0) -> bool:
+        """PING the device every 50 ms until it answers PONG or deadline passes
+
+        Replaces a fixed settle delay: a device that is already up answers
+        the first probe, and one that is still booting gets up to
+        ``deadline`` seconds.
+        """
+        old_timeout = self.ser.timeout
+        self.ser.timeout = 0.05
+        try:
+            end = time.perf_counter() + deadline
+            while time.perf_counter() < end:
+                self.ser.write(self._cmd_cache["PING"])
+                line = self.ser.read_until(b"\n", MAX_LINE)
+                while line:
+                    if line.strip() == b"PONG":
+                        return True
+                    line = self.ser.read_until(b"\n", MAX_LINE)  # e.g. boot READY
+            return False
+        finally:
+            self.ser.timeout = old_timeout
+            
+    def _drain(self, quiet_ms: int = 50, max_ms: int = 500):
+        """Read and discard input until the line has been idle for quiet_ms
+
+        Used instead of a fixed sleep plus reset_input_buffer(), whose flush
+        ioctl can itself block on some USB-serial drivers. Gives up after
+        max_ms if the device keeps sending.
+        """
+        start = last = time.perf_counter()
+        while True:
+            now = time.perf_counter()
+            if now - last >= quiet_ms / 1000 or now - start >= max_ms / 1000:
+                break
+                
+            waiting = self.ser.in_waiting
+            if waiting:
+                self.ser.read(waiting)
+                last = time.perf_counter()
+            else:
+                time.sleep(0.005)
+                
+    def _enable_low_latency(self):
+        """Stop the USB-serial driver from batching received bytes
+
+        FTDI-style adapters hold RX data for up to 16 ms by default, which
+        puts a floor under every command round trip. Best effort, Linux only.
+        """
+        if not sys.platform.startswith('linux'):
+            return
+            
+        try:
+            # Sets ASYNC_LOW_LATENCY via TIOCGSERIAL/TIOCSSERIAL
+            self.ser.set_low_latency_mode(True)
+            print_info("Low-latency mode enabled")
+            return
+        except (ValueError, NotImplementedError):
+            pass
+            
+        # Fallback: usb-serial drivers expose the latency timer in sysfs
+        tty = os.path.basename(os.path.realpath(self.ser.port))
+        try:
+            with open(f"/sys/bus/usb-serial/devices/{tty}/latency_timer", "w") as f:
+                f.write("1")
+            print_info("USB latency timer set to 1 ms")
+        except OSError as e:
+            print_info(f"Low-latency mode not available ({e.strerror})")
+            
     def disconnect(self):
         """Close serial connection"""
+        if self._tx_sel:
+            self._tx_sel.close()
+            self._tx_sel = None
         if self.ser and self.ser.is_open:
-            self.ser.close()
+            self._reader.close()
+            if self._protocol.error is not None:
+                print_info(f"Reader stopped early: {self._protocol.error}")
             print_info("Disconnected")
             
-    def send_command(self, cmd: str, timeout: float = None) -> Tuple[bool, str]:
-        """Send command and wait for response"""
-        if timeout is not None:
-            old_timeout = self.ser.timeout
-            self.ser.timeout = timeout
-            
+    def _readline(self, timeout: float = None) -> bytes:
+        """Return the next received line, or b"" if none arrives in time"""
         try:
-            # Send command
-            self.ser.write(f"{cmd}\n".encode('utf-8'))
+            return self._lines.get(timeout=self.timeout if timeout is None else timeout)
+        except queue.Empty:
+            return b""
             
-            # Read response
-            response = self.ser.readline().decode('utf-8', errors='ignore').strip()
+    def send_command_bytes(self, cmd_bytes: bytes, timeout: float = None) -> Tuple[bool, bytes]:
+        """Send an encoded, newline-terminated command and return the raw response"""
+        try:
+            self.ser.write(cmd_bytes)
+            return (True, self._readline(timeout))
+        except serial.SerialTimeoutException as e:
+            return (False, f"write_timeout: {e}".encode('utf-8'))
+        except Exception as e:
+            return (False, str(e).encode('utf-8'))
             
-            if timeout is not None:
-                self.ser.timeout = old_timeout
-                
-            return (True, response)
+    def _encode(self, cmd: str) -> bytes:
+        """Return the newline-terminated command line, cached per command"""
+        buf = self._cmd_cache.get(cmd)
+        if buf is None:
+            buf = encode_line(cmd)
+            self._cmd_cache[cmd] = buf
+        return buf
+        
+    def send_command(self, cmd: str, timeout: float = None) -> Tuple[bool, str]:
+        """Send command and wait for response"""
+        success, response = self.send_command_bytes(self._encode(cmd), timeout)
+        return (success, response.decode('utf-8', errors='ignore').strip())
+        
+    def send_batch(self, cmds: List[str], timeout: float = None) -> List[Tuple[bool, str]]:
+        """Send several commands in one write() and return their responses in order"""
+        try:
+            self.ser.write(b"".join(self._encode(cmd) for cmd in cmds))
+        except serial.SerialTimeoutException as e:
+            return [(False, f"write_timeout: {e}")] * len(cmds)
         except Exception as e:
-            if timeout is not None:
-                self.ser.timeout = old_timeout
-            return (False, str(e))
+            return [(False, str(e))] * len(cmds)
             
-    def test_basic_commands(self):
-        """Test basic command functionality"""
-        tests = [
-            ("PING", "PONG", "PING command"),
-            ("VERSION", "ESP32S3_UART_REF v1", "VERSION command"),
-        ]
+        return [(True, self._readline(timeout).decode('utf-8', errors='ignore').strip())
+                for _ in cmds]
+                
+    # (command, expected response, description) checked by test_basic_commands
+    BASIC_TESTS = [
+        ("PING", "PONG", "PING command"),
+        ("VERSION", "ESP32S3_UART_REF v1", "VERSION command"),
+    ]
+    
+    def run_basic_tests(self):
+        """Run the basic, UPTIME and unknown command tests from one batched write"""
+        cmds = [cmd for cmd, _, _ in self.BASIC_TESTS] + ["UPTIME", "INVALID_COMMAND"]
+        replies = self.send_batch(cmds)
+        
+        self.test_basic_commands(replies[:-2])
+        self.test_uptime(replies[-2])
+        self.test_unknown_command(replies[-1])
         
-        for cmd, expected, desc in tests:
+    def test_basic_commands(self, replies: List[Tuple[bool, str]] = None):
+        """Test basic command functionality"""
+        for i, (cmd, expected, desc) in enumerate(self.BASIC_TESTS):
             print_test(desc)
-            success, response = self.send_command(cmd)
+            success, response = replies[i] if replies else self.send_command(cmd)
             
             if success and response == expected:
                 print_pass(f"Got expected response: '{response}'")
@@ -128,10 +417,10 @@ class UARTTester:
                 print_fail(f"Expected '{expected}', got '{response}'")
                 self.test_failed += 1
                 
-    def test_uptime(self):
+    def test_uptime(self, reply: Tuple[bool, str] = None):
         """Test UPTIME command"""
         print_test("UPTIME command")
-        success, response = self.send_command("UPTIME")
+        success, response = reply or self.send_command("UPTIME")
         
         if success and response.startswith("UPTIME_MS "):
             try:
@@ -146,10 +435,10 @@ class UARTTester:
             print_fail(f"Unexpected response: '{response}'")
             self.test_failed += 1
             
-    def test_unknown_command(self):
+    def test_unknown_command(self, reply: Tuple[bool, str] = None):
         """Test error handling for unknown commands"""
         print_test("Unknown command handling")
-        success, response = self.send_command("INVALID_COMMAND")
+        success, response = reply or self.send_command("INVALID_COMMAND")
         
         if success and response == "ERR UNKNOWN_CMD":
             print_pass(f"Error handled correctly: '{response}'")
@@ -158,33 +447,119 @@ class UARTTester:
             print_fail(f"Expected 'ERR UNKNOWN_CMD', got '{response}'")
             self.test_failed += 1
             
-    def test_stress(self, count: int = 100):
-        """Stress test with rapid commands"""
-        print_test(f"Stress test ({count} commands)")
+    def _ping_fast(self) -> bool:
+        """Send one PING and report whether PONG came back within 100 ms"""
+        return self._send_ping(0.1) == b"PONG"
+        
+    def _write_raw(self, data: bytes):
+        """Write straight to the file descriptor, honouring the write timeout
+
+        pyserial opens the port non-blocking, so a full TX buffer shows up as
+        a short write or BlockingIOError rather than a blocked call.
+        """
+        view = memoryview(data)
+        while view:
+            try:
+                view = view[os.write(self._fd, view):]
+            except BlockingIOError:
+                if not self._tx_sel.select(self.timeout):
+                    raise serial.SerialTimeoutException("Write timeout")
+            except OSError as e:
+                # Same exception pyserial's write() raises, e.g. on unplug
+                raise serial.SerialException(f"write failed: {e}")
+        
+    def test_stress(self, count: int = 100, pipeline: int = 32):
+        """Stress test with rapid commands
+
+        Up to ``pipeline`` PINGs are kept in flight: each refill of the window
+        is a single write(), and the PONGs are read back in order, so the
+        serial round-trip latency is paid once per window instead of once
+        per command. A window of 1 uses a plain PING/PONG loop and does not
+        time individual commands, so the average latency is only reported
+        for larger windows.
+        """
+        print_test(f"Stress test ({count} commands, pipeline {pipeline})")
         
-        start_time = time.time()
         sent = 0
         received = 0
         errors = 0
+        in_flight = deque()  # send timestamps (ns) of outstanding PINGs
+        latency_ns = 0
+        progress = []  # (commands done, seconds elapsed) every 100 commands
+        # On a terminal progress is redrawn in place on one line; otherwise
+        # the samples are written in one go after the timed run
+        live = sys.stdout.isatty() and getattr(_output, 'lines', None) is None
+        first_bad = None
+        ping = self._cmd_cache["PING"]
+        perf_ns = time.perf_counter_ns
         
-        for i in range(count):
-            success, response = self.send_command("PING", timeout=0.1)
-            sent += 1
-            
-            if success and response == "PONG":
-                received += 1
+        write, ping_once = self._write, self._ping_fast
+        
+        def sample(done: int):
+            """Record (or, on a terminal, redraw) progress every 100 commands"""
+            self._check_stop()
+            at = (perf_ns() - start_ns) / 1e9
+            if live:
+                sys.stdout.write("\r" + _PROGRESS_FMT % (done, count, at))
+                sys.stdout.flush()
             else:
-                errors += 1
-                
-            # Progress indicator every 100 commands
-            if (i + 1) % 100 == 0:
-                print_info(f"Progress: {i + 1}/{count}")
+                progress.append((done, at))
                 
-        elapsed = time.time() - start_time
+        start_ns = perf_ns()
+        
+        try:
+            if pipeline == 1:
+                for i in range(count):
+                    received += ping_once()
+                    sent += 1
+                    
+                    if (i + 1) % 100 == 0:
+                        sample(i + 1)
+                errors = sent - received
+            else:
+                while received + errors < count:
+                    # Producer: top up the in-flight window with one write
+                    n = min(pipeline - len(in_flight), count - sent)
+                    if n > 0:
+                        write(ping * n)
+                        in_flight.extend([perf_ns()] * n)
+                        sent += n
+                        
+                    # Consumer: the next line answers the oldest outstanding PING
+                    response = self._readline(0.1)
+                    sent_at = in_flight.popleft()
+                    
+                    if response == b"PONG":
+                        received += 1
+                        latency_ns += perf_ns() - sent_at
+                    else:
+                        errors += 1
+                        if first_bad is None:
+                            first_bad = response
+                            
+                    done = received + errors
+                    if done % 100 == 0:
+                        sample(done)
+        except serial.SerialTimeoutException:
+            print_info(f"Write timed out after {sent} commands (device not reading)")
+            errors = count - received
+        except serial.SerialException as e:
+            print_info(f"Serial error during stress test: {e}")
+            errors = count - received
+            
+        elapsed = (perf_ns() - start_ns) / 1e9
         rate = count / elapsed
         
+        if live and count >= 100:
+            sys.stdout.write("\n")  # End the redrawn progress line
+        elif progress:
+            emit("\n".join(_PROGRESS_FMT % (done, count, at) for done, at in progress))
         print_info(f"Sent: {sent}, Received: {received}, Errors: {errors}")
         print_info(f"Time: {elapsed:.2f}s, Rate: {rate:.2f} cmd/s")
+        if latency_ns:
+            print_info(f"Avg latency: {latency_ns / received / 1e6:.2f} ms")
+        if first_bad is not None:
+            print_info(f"First unexpected response: '{first_bad.decode('utf-8', errors='ignore')}'")
         
         if errors == 0:
             print_pass("All commands successful")
@@ -196,81 +571,195 @@ class UARTTester:
             print_fail(f"High error rate: {errors/count*100:.2f}%")
             self.test_failed += 1
             
+    # Longer than the firmware's 256-byte line buffer
+    _LONG_PROBE = b"X" * 300 + b"\n"
+    
     def test_buffer_overflow(self):
         """Test buffer handling with long input"""
         print_test("Buffer overflow handling")
         
         # Send command longer than buffer (>256 bytes)
-        long_cmd = "X" * 300
-        success, response = self.send_command(long_cmd, timeout=2.0)
+        success, response = self.send_command_bytes(self._LONG_PROBE, timeout=2.0)
         
         # Should either handle gracefully or respond with error
         if success:
-            print_pass(f"Handled long input gracefully: '{response[:50]}...'")
+            response = response[:50].decode('utf-8', errors='ignore')
+            print_pass(f"Handled long input gracefully: '{response}...'")
             self.test_passed += 1
         else:
             print_info("Long input caused timeout (expected behavior)")
             self.test_passed += 1
             
-    def print_summary(self):
-        """Print test summary"""
+    def _check_stop(self):
+        """Raise KeyboardInterrupt if the run was stopped from another thread
+
+        SIGINT only reaches the main thread, so parallel runs are
+        interrupted through the stop event instead.
+        """
+        if self.stop.is_set():
+            raise KeyboardInterrupt
+            
+    def run_all(self, stress: bool = False, count: int = 100, pipeline: int = 32,
+                buffered: bool = False) -> int:
+        """Connect, run the test suite, disconnect and print the summary
+
+        With ``buffered`` set, output is held back and printed as one block
+        when the run ends, so concurrent runs on other ports don't interleave.
+        In quiet mode the per-test output is dropped, except on a failed
+        connect where it goes to stderr.
+        """
+        if buffered or self.quiet:
+            _output.lines = [f"{Colors.BOLD}### {self.port}{Colors.RESET}"] if buffered else []
+            
+        status = None
+        try:
+            if not self.connect():
+                return 1
+                
+            try:
+                # Basic tests
+                self.run_basic_tests()
+                self._check_stop()
+                self.test_buffer_overflow()
+                
+                # Stress test (optional)
+                if stress:
+                    self._check_stop()
+                    self.test_stress(count, pipeline)
+                    
+            except KeyboardInterrupt:
+                emit(f"\n{Colors.YELLOW}Test interrupted by user{Colors.RESET}")
+            finally:
+                self.disconnect()
+                
+            status = self.print_summary(f"{self.port} " if buffered else "")
+            return status
+        finally:
+            lines = getattr(_output, 'lines', None)
+            _output.lines = None
+            if lines is not None and (not self.quiet or status is None):
+                out = sys.stderr if self.quiet else sys.stdout
+                with _print_lock:
+                    out.write("\n".join(lines) + "\n")
+                    
+    def print_summary(self, label: str = ""):
+        """Print test summary
+
+        In quiet mode this is a single uncolored ``PASS <n> FAIL <n>`` line,
+        prefixed with ``label``, for CI logs and scripts.
+        """
+        if self.quiet:
+            with _print_lock:
+                sys.stdout.write("%sPASS %d FAIL %d\n" % (label, self.test_passed, self.test_failed))
+            return 1 if self.test_failed else 0
+            
         total = self.test_passed + self.test_failed
-        print(f"\n{Colors.BOLD}{'='*50}{Colors.RESET}")
-        print(f"{Colors.BOLD}Test Summary{Colors.RESET}")
-        print(f"{'='*50}")
-        print(f"Total Tests: {total}")
-        print(f"{Colors.GREEN}Passed: {self.test_passed}{Colors.RESET}")
-        print(f"{Colors.RED}Failed: {self.test_failed}{Colors.RESET}")
+        emit(f"\n{Colors.BOLD}{'='*50}{Colors.RESET}")
+        emit(f"{Colors.BOLD}Test Summary{Colors.RESET}")
+        emit(f"{'='*50}")
+        emit(f"Total Tests: {total}")
+        emit(f"{Colors.GREEN}Passed: {self.test_passed}{Colors.RESET}")
+        emit(f"{Colors.RED}Failed: {self.test_failed}{Colors.RESET}")
         
         if self.test_failed == 0:
-            print(f"\n{Colors.GREEN}{Colors.BOLD}✓ ALL TESTS PASSED{Colors.RESET}\n")
+            emit(f"\n{Colors.GREEN}{Colors.BOLD}✓ ALL TESTS PASSED{Colors.RESET}\n")
             return 0
         else:
-            print(f"\n{Colors.RED}{Colors.BOLD}✗ SOME TESTS FAILED{Colors.RESET}\n")
+            emit(f"\n{Colors.RED}{Colors.BOLD}✗ SOME TESTS FAILED{Colors.RESET}\n")
             return 1
 
 
-def main():
-    """Main function"""
+def _make_sender(cmd: str):
+    """Build a UARTTester method that sends one fixed command and returns the raw reply"""
+    cmd_bytes = encode_line(cmd)
+    
+    def send(self, timeout: float = None) -> bytes:
+        self._write(cmd_bytes)
+        return self._readline(timeout)
+    send.__name__ = f"_send_{cmd.lower()}"
+    return send
+
+
+# Specialized sender for the stress test's one-at-a-time PING loop
+UARTTester._send_ping = _make_sender("PING")
+
+
+def _build_parser():
+    """Build the argparse parser (imported lazily, see parse_args)"""
+    import argparse
+    
     parser = argparse.ArgumentParser(
         description='Test UART communication with ESP32',
         formatter_class=argparse.RawDescriptionHelpFormatter
     )
     
-    parser.add_argument('port', help='Serial port (e.g., /dev/ttyUSB0 or COM3)')
+    parser.add_argument('port', help='Serial port (e.g., /dev/ttyUSB0 or COM3); '
+                        'separate several ports with commas to test them in parallel')
     parser.add_argument('--baud', type=int, default=115200, help='Baud rate (default: 115200)')
     parser.add_argument('--timeout', type=float, default=1.0, help='Response timeout in seconds')
     parser.add_argument('--stress', action='store_true', help='Run stress test')
     parser.add_argument('--count', type=int, default=100, help='Number of stress test iterations')
+    parser.add_argument('--pipeline', type=int, default=32,
+                        help='Max PINGs in flight during the stress test (default: 32)')
     parser.add_argument('--all', action='store_true', help='Run all tests including stress')
-    
+    parser.add_argument('--quiet', action='store_true',
+                        help="Only print a one-line 'PASS <n> FAIL <n>' summary")
+    return parser
+
+
+def parse_args():
+    """Parse command line arguments
+
+    The common ``test_uart.py <port>`` smoke-test call is answered without
+    importing argparse at all.
+    """
+    if len(sys.argv) == 2 and not sys.argv[1].startswith('-'):
+        # Must match the argparse defaults in _build_parser()
+        return SimpleNamespace(port=sys.argv[1], baud=115200, timeout=1.0,
+                               stress=False, count=100, pipeline=32, all=False,
+                               quiet=False)
+        
+    parser = _build_parser()
     args = parser.parse_args()
+    if args.pipeline < 1:
+        parser.error('--pipeline must be at least 1')
+    return args
+
+
+def main():
+    """Main function"""
+    args = parse_args()
+    ports = [p.strip() for p in args.port.split(',') if p.strip()]
+    if not ports:
+        # The fast path in parse_args() skips argparse, so check here
+        _build_parser().error(f'no serial port given in {args.port!r}')
     
-    print(f"{Colors.BOLD}ESP32 UART Reference - Test Suite{Colors.RESET}")
-    print(f"{'='*50}\n")
+    if not args.quiet:
+        print(f"{Colors.BOLD}ESP32 UART Reference - Test Suite{Colors.RESET}")
+        print(f"{'='*50}\n")
     
-    tester = UARTTester(args.port, args.baud, args.timeout)
+    run_stress = args.stress or args.all
+    stop = threading.Event()
+    testers = [UARTTester(port, args.baud, args.timeout, args.quiet, stop) for port in ports]
     
-    if not tester.connect():
-        return 1
-        
-    try:
-        # Basic tests
-        tester.test_basic_commands()
-        tester.test_uptime()
-        tester.test_unknown_command()
-        tester.test_buffer_overflow()
+    if len(testers) == 1:
+        return testers[0].run_all(run_stress, args.count, args.pipeline)
         
-        # Stress test (optional)
-        if args.stress or args.all:
-            tester.test_stress(args.count)
+    # Imported here: it pulls in logging, which single-port runs don't need
+    from concurrent.futures import ThreadPoolExecutor
+    
+    # Serial I/O releases the GIL, so ports are tested side by side
+    with ThreadPoolExecutor(max_workers=len(testers)) as pool:
+        futures = [pool.submit(t.run_all, run_stress, args.count, args.pipeline, buffered=True)
+                   for t in testers]
+        try:
+            results = [f.result() for f in futures]
+        except KeyboardInterrupt:
+            # Workers never see SIGINT; ask them to wind down and disconnect
+            stop.set()
+            results = [f.result() for f in futures]
             
-    except KeyboardInterrupt:
-        print(f"\n{Colors.YELLOW}Test interrupted by user{Colors.RESET}")
-    finally:
-        tester.disconnect()
-        
-    return tester.print_summary()
+    return max(results)
 
 
 if __name__ == '__main__':
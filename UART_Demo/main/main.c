@@ -103,12 +103,16 @@ static void line_acc_reset(line_acc_t *a)
  * Carriage returns '\r' are ignored. If the line exceeds the buffer, the line is
  * dropped and the accumulator is reset (simple overflow policy).
  *
+ * Consumption stops right after the newline, so bytes of any following
+ * commands in @p data are left for the next call.
+ *
  * @param[in,out] a Pointer to the accumulator.
  * @param[in] data Byte buffer to consume.
  * @param[in] n Number of bytes in @p data.
+ * @param[out] consumed Number of bytes of @p data consumed.
  * @return int 1 if a full line is ready (terminated by '\n'), 0 otherwise.
  */
-static int line_acc_push(line_acc_t *a, const uint8_t *data, size_t n)
+static int line_acc_push(line_acc_t *a, const uint8_t *data, size_t n, size_t *consumed)
 {
     for (size_t i = 0; i < n; i++) {
         char c = (char)data[i];
@@ -119,6 +123,7 @@ static int line_acc_push(line_acc_t *a, const uint8_t *data, size_t n)
 
         if (c == '\n') {
             a->line[a->len] = '\0';
+            *consumed = i + 1;
             return 1;
         }
 
@@ -129,6 +134,7 @@ static int line_acc_push(line_acc_t *a, const uint8_t *data, size_t n)
             line_acc_reset(a);
         }
     }
+    *consumed = n;
     return 0;
 }
 
@@ -361,10 +367,16 @@ static void uart_parser_task(void *arg)
             continue;
         }
 
-        if (line_acc_push(&acc, tmp, n)) {
-            ESP_LOGI(TAG, "CMD: %s", acc.line);
-            handle_line(acc.line);
-            line_acc_reset(&acc);
+        // A chunk may hold several commands (e.g. pipelined by the host)
+        size_t off = 0;
+        while (off < n) {
+            size_t used = 0;
+            if (line_acc_push(&acc, tmp + off, n - off, &used)) {
+                ESP_LOGI(TAG, "CMD: %s", acc.line);
+                handle_line(acc.line);
+                line_acc_reset(&acc);
+            }
+            off += used;
         }
     }
 }